@@ -3,15 +3,20 @@ import asyncio
 import logging
 from datetime import timedelta
 import aiohttp
+from yarl import URL
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import aiohttp_client
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import aiohttp_client, entity_registry as er
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util.json import json_loads
 
 from .const import (
     DOMAIN, DEFAULT_SCAN_INTERVAL_CLIMATE, DEFAULT_SCAN_INTERVAL_SENSOR,
-    MODE_MAP, FAN_MAP
+    REQUEST_REFRESH_DELAY,
+    MODE_MAP, FAN_MAP, FAN_EXTRA_HIGH_CODES, OFFLINE_ERROR_CODES
 )
 
 # Импортируем новый модуль
@@ -20,15 +25,28 @@ from .power_meter import fetch_power_data
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS = ["climate", "sensor"]
 
+
+def idu_uid(sys, addr) -> str:
+    """Ключ блока вида "S<sys>_<addr>": один и тот же для топологии и данных блока."""
+    return f"S{sys}_{addr}"
+
+
 class HisenseClient:
     """Клиент для взаимодействия с устройством Hisense Multi-IDU."""
     
     def __init__(self, host: str, session: aiohttp.ClientSession):
         self._host = host
         self._session = session
+        # URL собираем один раз: aiohttp принимает yarl.URL без повторного разбора строки
+        base_url = URL(f"http://{host}/cgi")
+        self._miscdata_url = base_url / "get_miscdata.shtml"
+        self._idu_data_url = base_url / "get_idu_data.shtml"
+        self._set_idu_url = base_url / "set_idu.shtml"
         self._miscdata_cache = None
         self._miscdata_timestamp = 0
         self._last_idu_data = {}  # Кэш последних данных IDU
+        # Последний опрос IDU пропущен: все блоки исключены (их сущности отключены)
+        self.idu_poll_skipped = False
     
     async def get_miscdata(self, use_cache=True):
         """Получает топологию устройств с кэшированием."""
@@ -39,10 +57,9 @@ class HisenseClient:
         if use_cache and self._miscdata_cache is not None and current_time - self._miscdata_timestamp < 300:
             return self._miscdata_cache
             
-        url = f"http://{self._host}/cgi/get_miscdata.shtml"
         try:
             async with self._session.post(
-                url, 
+                self._miscdata_url,
                 json={"ip": "127.0.0.1"},
                 timeout=10
             ) as resp:
@@ -50,7 +67,7 @@ class HisenseClient:
                     _LOGGER.warning("HTTP error when getting miscdata: %s", resp.status)
                     return None
                 
-                data = await resp.json(content_type=None)
+                data = json_loads(await resp.read())
                 if data.get("status") != "success":
                     _LOGGER.warning("API returned error for miscdata: %s", data)
                     return None
@@ -67,25 +84,140 @@ class HisenseClient:
             _LOGGER.error("Failed to get miscdata: %s", e)
             return None
     
-    async def get_idu_data(self, force_refresh=False):
-        """Получает данные всех внутренних блоков."""
+    async def _get_idu_topology(self, force_refresh=False):
+        """Возвращает список IDU из топологии и индекс по (sys, addr)."""
+        miscdata = await self.get_miscdata(use_cache=not force_refresh)
+        if not miscdata:
+            return None, None
+        
+        topo = miscdata.get("topo", [])
+        
+        # Фильтруем только IDU (внутренние блоки)
+        idu_list = [item for item in topo if item.get("type") == "IDU"]
+        
+        # Индекс топологии по (sys, addr): один проход вместо поиска для каждого блока.
+        # reversed() сохраняет приоритет первой записи при дубликатах
+        topo_index = {
+            (t.get("sysAdr"), str(t.get("address"))): t
+            for t in reversed(idu_list)
+        }
+        return idu_list, topo_index
+    
+    async def _request_idu_dats(self, devs):
+        """Запрашивает сырые данные для списка блоков. None - при ошибке."""
+        async with self._session.post(
+            self._idu_data_url,
+            json={"ip": "127.0.0.1", "devs": devs},
+            timeout=15
+        ) as resp:
+            if resp.status != 200:
+                _LOGGER.warning("HTTP error when getting IDU data: %s", resp.status)
+                return None
+            
+            data = json_loads(await resp.read())
+            if data.get("status") != "success":
+                _LOGGER.warning("API returned error for IDU data: %s", data)
+                return None
+            
+            idu_dats = data.get("dats", [])
+            if not idu_dats:
+                _LOGGER.warning("No IDU data in response")
+                return None
+            return idu_dats
+    
+    @staticmethod
+    def _parse_idu(item, topo_index):
+        """Разбирает данные одного блока. Возвращает (ключ, данные) или None."""
+        sys = item.get("sys")
+        addr = item.get("addr")
+        key = idu_uid(sys, addr)
+        
+        # Находим соответствующую запись в топологии
+        topo_info = topo_index.get((sys, str(addr)), {})
+        
+        # Парсим данные
+        raw_data = item.get("data", [])
+        if len(raw_data) < 40:  # Проверяем, что данных достаточно
+            _LOGGER.warning("Raw data too short for %s: %s", key, len(raw_data))
+            return None
+        
+        unit = {
+            "sys": sys,
+            "addr": addr,
+            "raw_data": raw_data,
+            "name": topo_info.get("name", f"IDU S{sys}-{addr}"),
+            "code": topo_info.get("code", ""),
+            "pname": topo_info.get("pname", ""),
+            "ppname": topo_info.get("ppname", ""),
+            "pppname": topo_info.get("pppname", ""),
+            "indoor_name": topo_info.get("indoorName", ""),
+            "tenant_name": topo_info.get("tenantName", ""),
+            
+            # Парсим основные параметры (используем прямые значения из массива)
+            "power": raw_data[28] if len(raw_data) > 28 else 0,
+            "mode_code": raw_data[29] if len(raw_data) > 29 else 2,
+            "fan_code": raw_data[30] if len(raw_data) > 30 else 4,
+            "set_temp": raw_data[31] if len(raw_data) > 31 else 24,
+            "error_code": raw_data[35] if len(raw_data) > 35 else 0,
+            "room_temp": raw_data[39] if len(raw_data) > 39 else None,  # Индекс 39
+            "pipe_temp": raw_data[38] if len(raw_data) > 38 else None,  # Индекс 38
+            
+            # Регистры блокировки
+            "model1": raw_data[72] if len(raw_data) > 72 else 0,
+            "model2": raw_data[73] if len(raw_data) > 73 else 0,
+            "model3": raw_data[74] if len(raw_data) > 74 else 0,
+            "model4": raw_data[75] if len(raw_data) > 75 else 0,
+            "model5": raw_data[77] if len(raw_data) > 77 else 0,
+        }
+        
+        # Преобразуем коды в строки: выборка из таблиц вместо цепочек if/else
+        unit["mode"] = MODE_MAP.get(unit["mode_code"], "cool")
+        # Нестандартную скорость преобразуем в ближайшую стандартную
+        unit["fan"] = FAN_MAP.get(unit["fan_code"]) or (
+            "high" if unit["fan_code"] in FAN_EXTRA_HIGH_CODES else "medium"
+        )
+        
+        # Определяем статус
+        error = unit["error_code"]
+        if error:
+            unit["status"] = "offline" if error in OFFLINE_ERROR_CODES else "alarm"
+        else:
+            unit["status"] = "on" if unit["power"] == 1 else "off"
+        
+        # Отладочная информация
+        _LOGGER.debug("Device %s: power=%s, mode=%s, fan=%s, set_temp=%s, room_temp=%s, pipe_temp=%s",
+                     key, unit["power"], unit["mode"], 
+                     unit["fan"], unit["set_temp"],
+                     unit["room_temp"], unit["pipe_temp"])
+        return key, unit
+    
+    async def get_idu_data(self, force_refresh=False, exclude=None):
+        """Получает данные внутренних блоков, кроме блоков из exclude."""
+        self.idu_poll_skipped = False
         try:
             # Получаем топологию
-            miscdata = await self.get_miscdata(use_cache=not force_refresh)
-            if not miscdata:
+            idu_list, topo_index = await self._get_idu_topology(force_refresh)
+            if idu_list is None:
                 _LOGGER.warning("No miscdata received, returning cached data if available")
                 # Возвращаем кэшированные данные, если есть
                 return self._last_idu_data
             
-            topo = miscdata.get("topo", [])
-            
-            # Фильтруем только IDU (внутренние блоки)
-            idu_list = [item for item in topo if item.get("type") == "IDU"]
-            
             if not idu_list:
                 _LOGGER.warning("No IDU devices found in topology")
                 return {}
             
+            # Не опрашиваем блоки, сущности которых отключены
+            if exclude:
+                idu_list = [
+                    item for item in idu_list
+                    if idu_uid(item.get("sysAdr", 1), item.get("address", "1")) not in exclude
+                ]
+                if not idu_list:
+                    _LOGGER.debug("All IDU entities are disabled, skipping IDU poll")
+                    self.idu_poll_skipped = True
+                    self._last_idu_data = {}
+                    return {}
+            
             # Формируем список устройств для запроса
             devs = [
                 {
@@ -95,114 +227,23 @@ class HisenseClient:
                 for item in idu_list
             ]
             
-            url = f"http://{self._host}/cgi/get_idu_data.shtml"
-            async with self._session.post(
-                url,
-                json={"ip": "127.0.0.1", "devs": devs},
-                timeout=15
-            ) as resp:
-                if resp.status != 200:
-                    _LOGGER.warning("HTTP error when getting IDU data: %s", resp.status)
-                    # Возвращаем кэшированные данные
-                    return self._last_idu_data
-                
-                data = await resp.json(content_type=None)
-                if data.get("status") != "success":
-                    _LOGGER.warning("API returned error for IDU data: %s", data)
-                    # Возвращаем кэшированные данные
-                    return self._last_idu_data
-                
-                # Объединяем данные с топологией
-                result = {}
-                idu_dats = data.get("dats", [])
-                
-                if not idu_dats:
-                    _LOGGER.warning("No IDU data in response")
-                    return self._last_idu_data
-                
-                for item in idu_dats:
-                    sys = item.get("sys")
-                    addr = item.get("addr")
-                    key = f"S{sys}_{addr}"
-                    
-                    # Находим соответствующую запись в топологии
-                    topo_info = next(
-                        (t for t in idu_list 
-                         if t.get("sysAdr") == sys and str(t.get("address")) == str(addr)),
-                        {}
-                    )
-                    
-                    # Парсим данные
-                    raw_data = item.get("data", [])
-                    if len(raw_data) < 40:  # Проверяем, что данных достаточно
-                        _LOGGER.warning("Raw data too short for %s: %s", key, len(raw_data))
-                        continue
-                    
-                    result[key] = {
-                        "sys": sys,
-                        "addr": addr,
-                        "raw_data": raw_data,
-                        "name": topo_info.get("name", f"IDU S{sys}-{addr}"),
-                        "code": topo_info.get("code", ""),
-                        "pname": topo_info.get("pname", ""),
-                        "ppname": topo_info.get("ppname", ""),
-                        "pppname": topo_info.get("pppname", ""),
-                        "indoor_name": topo_info.get("indoorName", ""),
-                        "tenant_name": topo_info.get("tenantName", ""),
-                        
-                        # Парсим основные параметры (используем прямые значения из массива)
-                        "power": raw_data[28] if len(raw_data) > 28 else 0,
-                        "mode_code": raw_data[29] if len(raw_data) > 29 else 2,
-                        "fan_code": raw_data[30] if len(raw_data) > 30 else 4,
-                        "set_temp": raw_data[31] if len(raw_data) > 31 else 24,
-                        "error_code": raw_data[35] if len(raw_data) > 35 else 0,
-                        "room_temp": raw_data[39] if len(raw_data) > 39 else None,  # Индекс 39
-                        "pipe_temp": raw_data[38] if len(raw_data) > 38 else None,  # Индекс 38
-                        
-                        # Регистры блокировки
-                        "model1": raw_data[72] if len(raw_data) > 72 else 0,
-                        "model2": raw_data[73] if len(raw_data) > 73 else 0,
-                        "model3": raw_data[74] if len(raw_data) > 74 else 0,
-                        "model4": raw_data[75] if len(raw_data) > 75 else 0,
-                        "model5": raw_data[77] if len(raw_data) > 77 else 0,
-                    }
-                    
-                    # Преобразуем коды в строки
-                    if result[key]["mode_code"] in MODE_MAP:
-                        result[key]["mode"] = MODE_MAP[result[key]["mode_code"]]
-                    else:
-                        result[key]["mode"] = "cool"
-                    
-                    if result[key]["fan_code"] in FAN_MAP:
-                        result[key]["fan"] = FAN_MAP[result[key]["fan_code"]]
-                    else:
-                        # Если скорость не стандартная, преобразуем в ближайшую стандартную
-                        fan_code = result[key]["fan_code"]
-                        if fan_code in [16, 32, 64]:  # Дополнительные скорости
-                            result[key]["fan"] = "high"
-                        else:
-                            result[key]["fan"] = "medium"
-                    
-                    # Определяем статус
-                    error = result[key]["error_code"]
-                    if error != 0:
-                        if error in [60, 61, 64, 65]:
-                            result[key]["status"] = "offline"
-                        else:
-                            result[key]["status"] = "alarm"
-                    else:
-                        result[key]["status"] = "on" if result[key]["power"] == 1 else "off"
-                    
-                    # Отладочная информация
-                    _LOGGER.debug("Device %s: power=%s, mode=%s, fan=%s, set_temp=%s, room_temp=%s, pipe_temp=%s",
-                                 key, result[key]["power"], result[key]["mode"], 
-                                 result[key]["fan"], result[key]["set_temp"],
-                                 result[key]["room_temp"], result[key]["pipe_temp"])
-                
-                # Кэшируем результат
-                self._last_idu_data = result
-                _LOGGER.debug("Got IDU data for %s devices: %s", len(result), list(result.keys()))
-                return result
+            idu_dats = await self._request_idu_dats(devs)
+            if idu_dats is None:
+                # Возвращаем кэшированные данные
+                return self._last_idu_data
+            
+            # Объединяем данные с топологией
+            result = {}
+            for item in idu_dats:
+                parsed = self._parse_idu(item, topo_index)
+                if parsed is not None:
+                    key, unit = parsed
+                    result[key] = unit
+            
+            # Кэшируем результат
+            self._last_idu_data = result
+            _LOGGER.debug("Got IDU data for %s devices: %s", len(result), list(result.keys()))
+            return result
                 
         except asyncio.TimeoutError:
             _LOGGER.warning("Timeout getting IDU data from %s", self._host)
@@ -212,9 +253,9 @@ class HisenseClient:
             return self._last_idu_data
     
     async def get_power_data(self):
-        """Получает данные электросчетчика через отдельную функцию."""
+        """Получает данные электросчетчика через общую сессию клиента."""
         try:
-            power = await fetch_power_data(self._host)
+            power = await fetch_power_data(self._session, self._host)
             return power
         except Exception as e:
             _LOGGER.error("Failed to get power data: %s", e)
@@ -240,9 +281,8 @@ class HisenseClient:
                 ]
             })
             
-            url = f"http://{self._host}/cgi/set_idu.shtml"
             async with self._session.post(
-                url,
+                self._set_idu_url,
                 json={"ip": "127.0.0.1", "cmdList": cmd_list},
                 timeout=10
             ) as resp:
@@ -250,7 +290,7 @@ class HisenseClient:
                     _LOGGER.error("HTTP error when setting IDU: %s", resp.status)
                     return False
                 
-                data = await resp.json(content_type=None)
+                data = json_loads(await resp.read())
                 success = data.get("status") == "success"
                 if success:
                     _LOGGER.debug("Successfully set IDU S%s_%s: onoff=%s, mode=%s, fan=%s, temp=%s", 
@@ -269,15 +309,37 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     
     host = entry.data["host"]
-    session = aiohttp_client.async_get_clientsession(hass)
+    # Отдельная сессия с keep-alive: один контроллер, соединение переиспользуется между опросами
+    # (опрос счетчика раз в 30 с не укладывается в стандартные 15 с keep-alive)
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit_per_host=2, keepalive_timeout=75),
+        headers={"User-Agent": aiohttp_client.SERVER_SOFTWARE},
+    )
+    # Сессия закрывается при любом завершении записи, в том числе при ошибке настройки
+    entry.async_on_unload(session.close)
     client = HisenseClient(host, session)
     
+    entity_registry = er.async_get(hass)
+    uid_prefix = f"{DOMAIN}_"
+    
+    def disabled_units():
+        """Блоки, климатические сущности которых отключены в реестре.
+        
+        Читается при каждом опросе: отключение сущности не перезагружает запись.
+        """
+        return frozenset(
+            reg_entry.unique_id.removeprefix(uid_prefix)
+            for reg_entry in er.async_entries_for_config_entry(entity_registry, entry.entry_id)
+            if reg_entry.domain == "climate" and reg_entry.disabled_by is not None
+        )
+    
     # Координатор для климатических устройств
     async def update_climate_data():
         try:
-            data = await client.get_idu_data()
+            data = await client.get_idu_data(exclude=disabled_units())
             if not data:
-                _LOGGER.warning("No climate data received, might be first run")
+                if not client.idu_poll_skipped:
+                    _LOGGER.warning("No climate data received, might be first run")
                 return {}
             return data
         except Exception as e:
@@ -290,6 +352,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         name=f"{DOMAIN}_climate",
         update_method=update_climate_data,
         update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL_CLIMATE),
+        # Неизменившиеся данные не рассылаются сущностям
+        always_update=False,
+        # Команды нескольким блокам подряд приводят к одному опросу, а не к N
+        request_refresh_debouncer=Debouncer(
+            hass, _LOGGER, cooldown=REQUEST_REFRESH_DELAY, immediate=False
+        ),
     )
     
     # Координатор для датчика мощности
@@ -306,30 +374,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL_SENSOR),
     )
     
-    # Пробуем получить данные устройства один раз для инициализации
-    try:
-        _LOGGER.info("Trying to connect to Hisense device at %s", host)
-        initial_data = await client.get_idu_data(force_refresh=True)
-        _LOGGER.info("Initial connection successful. Found %s devices", len(initial_data))
-    except Exception as e:
-        _LOGGER.warning("Initial connection failed: %s", e)
-        initial_data = {}
+    _LOGGER.info("Trying to connect to Hisense device at %s", host)
     
-    # Первоначальное обновление данных координатора
-    try:
-        await coordinator_climate.async_config_entry_first_refresh()
-        _LOGGER.info("Climate coordinator initialized successfully")
-    except Exception as e:
-        _LOGGER.error("Failed to refresh climate data: %s", e)
-        # Устанавливаем пустые данные, но продолжаем настройку
-        coordinator_climate.data = initial_data
+    # Первоначальное обновление координаторов выполняем параллельно:
+    # медленный ответ по IDU не задерживает запрос электросчетчика
+    climate_result, sensor_result = await asyncio.gather(
+        coordinator_climate.async_config_entry_first_refresh(),
+        coordinator_sensor.async_config_entry_first_refresh(),
+        return_exceptions=True,
+    )
     
-    try:
-        await coordinator_sensor.async_config_entry_first_refresh()
-        _LOGGER.info("Sensor coordinator initialized. Data: %s", coordinator_sensor.data)
-    except Exception as e:
-        _LOGGER.warning("Failed to refresh sensor data: %s", e)
+    climate_error = climate_result if isinstance(climate_result, BaseException) else None
+    # Пустые данные допустимы, только если опрос пропущен из-за отключения всех блоков
+    if climate_error is not None or (
+        not coordinator_climate.data and not client.idu_poll_skipped
+    ):
+        # Блоки не получены - HA повторит настройку позже, вместо записи без сущностей
+        await session.close()
+        raise ConfigEntryNotReady(
+            f"No indoor units received from Hisense device at {host}"
+        ) from climate_error
+    _LOGGER.info("Climate coordinator initialized. Found %s devices",
+                 len(coordinator_climate.data))
+    
+    if isinstance(sensor_result, Exception):
+        _LOGGER.warning("Failed to refresh sensor data: %s", sensor_result)
         coordinator_sensor.data = None
+    else:
+        _LOGGER.info("Sensor coordinator initialized. Data: %s", coordinator_sensor.data)
     
     # Сохраняем ссылки
     hass.data[DOMAIN][entry.entry_id] = {
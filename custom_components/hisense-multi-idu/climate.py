@@ -1,19 +1,24 @@
 """Climate platform for Hisense Multi-IDU."""
+import asyncio
 import logging
-from homeassistant.components.climate import ClimateEntity, ClimateEntityFeature, HVACMode
+from types import MappingProxyType
+from homeassistant.components.climate import (
+    ATTR_HVAC_MODE, ClimateEntity, ClimateEntityFeature, HVACMode
+)
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
-    DOMAIN, MODE_MAP, MODE_REVERSE_MAP, 
-    FAN_MAP, FAN_REVERSE_MAP,
-    MODE_COOL, MODE_HEAT, MODE_DRY, MODE_FAN_ONLY
+    DOMAIN, AREA_KEYS, MODE_MAP, FAN_MAP, FAN_REVERSE_MAP,
+    MODE_COOL, MODE_HEAT, MODE_DRY, MODE_FAN_ONLY, FAN_MID
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-# Маппинг режимов устройства на HVACMode (без AUTO)
-DEVICE_TO_HVAC = {
+# Маппинг режимов устройства на HVACMode (без AUTO).
+# Таблицы только для чтения обернуты в MappingProxyType, чтобы их нельзя было изменить
+DEVICE_TO_HVAC = MappingProxyType({
     "cool": HVACMode.COOL,
     "heat": HVACMode.HEAT,
     "dry": HVACMode.DRY,
@@ -23,36 +28,86 @@ DEVICE_TO_HVAC = {
     "refresh": HVACMode.COOL,
     "sleep": HVACMode.COOL,
     "heat_sup": HVACMode.HEAT
-}
+})
+
+# Прямой переход от кода режима устройства к HVACMode, без промежуточной строки.
+# Коды - битовые флаги (до 1024), поэтому словарь, а не плотный кортеж
+MODE_CODE_TO_HVAC = MappingProxyType(
+    {code: DEVICE_TO_HVAC[mode] for code, mode in MODE_MAP.items()}
+)
+
+# Команда для каждого HVACMode: (onoff, код режима); None - оставить сохраненный режим
+HVAC_DISPATCH = MappingProxyType({
+    HVACMode.OFF: (0, None),
+    HVACMode.COOL: (1, MODE_COOL),
+    HVACMode.HEAT: (1, MODE_HEAT),
+    HVACMode.DRY: (1, MODE_DRY),
+    HVACMode.FAN_ONLY: (1, MODE_FAN_ONLY),
+})
 
-# Исправленный маппинг HVAC_TO_DEVICE
-HVAC_TO_DEVICE = {
-    HVACMode.COOL: "cool",
-    HVACMode.HEAT: "heat", 
-    HVACMode.DRY: "dry",
-    HVACMode.FAN_ONLY: "fan_only",
-}
+# Сохраненные настройки и соответствующие им поля данных блока
+SAVED_FIELDS = (("temp", "set_temp"), ("mode", "mode_code"), ("fan", "fan_code"))
+
+# Поддерживаемые функции и режимы HVAC (без AUTO)
+SUPPORTED_FEATURES = (
+    ClimateEntityFeature.TARGET_TEMPERATURE
+    | ClimateEntityFeature.FAN_MODE
+    | ClimateEntityFeature.TURN_OFF
+    | ClimateEntityFeature.TURN_ON
+)
+HVAC_MODES = (HVACMode.OFF, HVACMode.COOL, HVACMode.HEAT, HVACMode.DRY, HVACMode.FAN_ONLY)
 
 # Доступные скорости вентилятора в Home Assistant (только основные)
-HA_FAN_MODES = ["auto", "low", "medium", "high"]
+HA_FAN_MODES = ("auto", "low", "medium", "high")
+
+
+# Нормализация скоростей устройства в скорости HA. Заполняется из FAN_MAP при импорте,
+# неизвестные значения добавляются при первом появлении
+FAN_NORMALIZE: dict[str, str] = {fan: fan for fan in FAN_MAP.values()}
+FAN_NORMALIZE["mid"] = "medium"
+
+# Ключевые слова для разбора неизвестных скоростей, в порядке проверки
+FAN_KEYWORDS = (("low", "low"), ("medium", "medium"), ("mid", "medium"), ("high", "high"))
+
+
+def _normalize_fan(fan):
+    """Преобразует скорость устройства в одну из стандартных скоростей HA."""
+    result = FAN_NORMALIZE.get(fan)
+    if result is not None:
+        return result
+    
+    result = next((ha_fan for keyword, ha_fan in FAN_KEYWORDS if keyword in fan), "auto")
+    FAN_NORMALIZE[fan] = result
+    return result
+
+
+def _parse_uid(uid):
+    """Разбирает uid вида "S<sys>_<addr>" в (sys, addr)."""
+    # partition не создает промежуточный список
+    s_part, sep, addr_part = uid.partition('_')
+    if not sep:
+        return 1, 1
+    return (int(s_part[1:]) if s_part[:1] == 'S' else int(s_part)), int(addr_part)
+
 
 class HisenseIDUClimate(CoordinatorEntity, ClimateEntity):
     """Representation of a Hisense indoor unit."""
     
+    # Состояние приходит только от координатора
+    _attr_should_poll = False
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
-    _attr_supported_features = (
-        ClimateEntityFeature.TARGET_TEMPERATURE |
-        ClimateEntityFeature.FAN_MODE |
-        ClimateEntityFeature.TURN_OFF |
-        ClimateEntityFeature.TURN_ON
-    )
-    # Убрали HVACMode.AUTO
-    _attr_hvac_modes = [HVACMode.OFF, HVACMode.COOL, HVACMode.HEAT, HVACMode.DRY, HVACMode.FAN_ONLY]
+    _attr_supported_features = SUPPORTED_FEATURES
+    _attr_hvac_modes = HVAC_MODES
     _attr_fan_modes = HA_FAN_MODES
     _attr_min_temp = 16
     _attr_max_temp = 30
     _attr_target_temperature_step = 1
     
+    # Настройки по умолчанию, пока блок не прислал свои
+    _DEFAULT_MODE = MODE_COOL
+    _DEFAULT_FAN = FAN_MID
+    _DEFAULT_TEMP = 24
+    
     def __init__(self, coordinator, client, uid, device_info, entity_name=None):
         super().__init__(coordinator)
         self._client = client
@@ -60,13 +115,11 @@ class HisenseIDUClimate(CoordinatorEntity, ClimateEntity):
         self._device_info = device_info
         
         # Извлекаем sys и addr из uid
-        if '_' in uid:
-            s_part, addr_part = uid.split('_')
-            self._sys = int(s_part[1:])  # Убираем 'S'
-            self._addr = int(addr_part)
-        else:
-            self._sys = 1
-            self._addr = 1
+        self._sys, self._addr = _parse_uid(uid)
+        # Неизменная часть аргументов set_idu для этого блока
+        self._addr_kwargs = {"sys": self._sys, "addr": self._addr}
+        # Связанный метод клиента для отправки команд
+        self._set_idu = client.set_idu
         
         # Если передано имя объекта, используем его, иначе берем из device_info
         if entity_name:
@@ -77,138 +130,271 @@ class HisenseIDUClimate(CoordinatorEntity, ClimateEntity):
         self._attr_unique_id = f"{DOMAIN}_{uid}"
         self._attr_device_info = device_info
         
-        # Кэш текущих данных
+        # Кэш текущих данных и снимок координатора, из которого он получен
         self._current_data = {}
+        self._data_token = None
+        # Поля блока, разобранные из снимка один раз
+        self._power = 0
+        self._mode_code = self._DEFAULT_MODE
+        self._fan_code = self._DEFAULT_FAN
+        self._set_temp = self._DEFAULT_TEMP
+        # Последнее известное состояние блока (onoff, mode, fan, temp) для пропуска повторных команд
+        self._reported = None
+        # Команды блоку отправляются по одной. Команда, ожидающая очереди, дополняется
+        # новыми вызовами, и все они получают результат ее отправки
+        self._send_lock = asyncio.Lock()
+        self._sending = None
+        self._pending = None
+        self._pending_future = None
+        # Состояние, записанное в HA при последнем обновлении координатора
+        self._written_state = None
         # Сохраненные настройки (для использования при включении)
         self._saved_settings = {
-            "temp": 24,
-            "mode": MODE_COOL,
-            "fan": 4
+            "temp": self._DEFAULT_TEMP,
+            "mode": self._DEFAULT_MODE,
+            "fan": self._DEFAULT_FAN
         }
+        self._refresh_attrs()
     
     def _update_data(self):
         """Обновляет данные из координатора."""
         data = self.coordinator.data
-        if not data:
-            self._current_data = {}
+        # Тот же снимок данных координатора уже разобран - повторная работа не нужна.
+        # Храним саму ссылку, а не id(): так снимок не может быть подменен новым с тем же id
+        if data is self._data_token:
             return
-        
-        unit_data = data.get(self._uid, {})
+        self._data_token = data
+        unit_data = data.get(self._uid) if data else None
         if unit_data:
             self._current_data = unit_data
-            # Сохраняем текущие настройки для использования при включении
-            if unit_data.get("power", 0) == 1:  # Только если устройство включено
-                self._saved_settings = {
-                    "temp": unit_data.get("set_temp", 24),
-                    "mode": unit_data.get("mode_code", MODE_COOL),
-                    "fan": unit_data.get("fan_code", 4)
-                }
+            self._power = unit_data.get("power", 0)
+            self._mode_code = unit_data.get("mode_code", self._DEFAULT_MODE)
+            self._fan_code = unit_data.get("fan_code", self._DEFAULT_FAN)
+            self._set_temp = unit_data.get("set_temp", self._DEFAULT_TEMP)
+            self._reported = (self._power, self._mode_code, self._fan_code, self._set_temp)
+            # Сохраняем текущие настройки для использования при включении.
+            # Обновляем на месте и только присланные поля: неполный ответ не затирает
+            # сохраненные значения значениями по умолчанию
+            if self._power == 1:  # Только если устройство включено
+                saved = self._saved_settings
+                for saved_key, data_key in SAVED_FIELDS:
+                    value = unit_data.get(data_key)
+                    if value is not None:
+                        saved[saved_key] = value
         else:
             self._current_data = {}
+            self._power = 0
+            self._reported = None
     
-    @property
-    def available(self):
-        """Доступно ли устройство."""
-        self._update_data()
-        return bool(self._current_data)
-    
-    @property
-    def target_temperature(self):
+    def _refresh_attrs(self):
+        """Пересчитывает кэшируемые атрибуты из данных координатора."""
         self._update_data()
-        if self._current_data:
-            return self._current_data.get("set_temp", 24)
-        return self._saved_settings.get("temp", 24)
-    
-    @property
-    def current_temperature(self):
-        self._update_data()
-        return self._current_data.get("room_temp")
+        data = self._current_data
+        self._attr_available = bool(data)
+        self._attr_current_temperature = data.get("room_temp")
+        if self._power != 0:
+            self._attr_hvac_mode = MODE_CODE_TO_HVAC.get(self._mode_code, HVACMode.COOL)
+        else:
+            self._attr_hvac_mode = HVACMode.OFF
+        if data:
+            self._attr_target_temperature = self._set_temp
+            self._attr_fan_mode = _normalize_fan(data.get("fan", "auto"))
+        else:
+            self._attr_target_temperature = self._saved_settings["temp"]
+            self._attr_fan_mode = "auto"
+        self._refresh_extra_attrs()
     
-    @property
-    def hvac_mode(self):
-        self._update_data()
-        if not self._current_data:
-            return HVACMode.OFF
-        
-        power = self._current_data.get("power", 0)
-        if power == 0:
-            return HVACMode.OFF
-        
-        mode = self._current_data.get("mode", "cool")
-        return DEVICE_TO_HVAC.get(mode, HVACMode.COOL)
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Обновляет атрибуты один раз на каждое обновление координатора."""
+        self._refresh_attrs()
+        # Снимок координатора мог измениться только в других блоках - состояние не пишем
+        state = (
+            self._attr_available,
+            self._attr_current_temperature,
+            self._attr_hvac_mode,
+            self._attr_target_temperature,
+            self._attr_fan_mode,
+            self._attr_extra_state_attributes,
+        )
+        if state == self._written_state:
+            return
+        self._written_state = state
+        super()._handle_coordinator_update()
     
     @property
-    def fan_mode(self):
-        self._update_data()
-        if self._current_data:
-            fan = self._current_data.get("fan", "auto")
-            # Преобразуем нестандартные скорости в стандартные
-            if fan not in HA_FAN_MODES:
-                if "low" in fan:
-                    return "low"
-                elif "medium" in fan or "mid" in fan:
-                    return "medium"
-                elif "high" in fan:
-                    return "high"
-                else:
-                    return "auto"
-            return fan
-        return "auto"
+    def available(self):
+        """Доступно ли устройство."""
+        return self._attr_available
     
-    @property
-    def extra_state_attributes(self):
-        """Возвращает дополнительные атрибуты."""
-        self._update_data()
+    def _refresh_extra_attrs(self):
+        """Собирает дополнительные атрибуты; HA отдает их по ссылке при записи состояния."""
+        data = self._current_data
+        saved = self._saved_settings
         attrs = {}
         
-        if self._current_data:
+        if data:
             attrs.update({
-                "error_code": self._current_data.get("error_code", 0),
-                "status": self._current_data.get("status", "unknown"),
-                "code": self._current_data.get("code", ""),
-                "indoor_name": self._current_data.get("indoor_name", ""),
-                "tenant_name": self._current_data.get("tenant_name", ""),
-                "pipe_temperature": self._current_data.get("pipe_temp"),
-                "is_locked": self._current_data.get("model1", 0) == 1,
-                "original_fan": self._current_data.get("fan", ""),
-                "original_mode": self._current_data.get("mode", ""),
+                "error_code": data.get("error_code", 0),
+                "status": data.get("status", "unknown"),
+                "code": data.get("code", ""),
+                "indoor_name": data.get("indoor_name", ""),
+                "tenant_name": data.get("tenant_name", ""),
+                "pipe_temperature": data.get("pipe_temp"),
+                "is_locked": data.get("model1", 0) == 1,
+                "original_fan": data.get("fan", ""),
+                "original_mode": data.get("mode", ""),
                 "sys": self._sys,
                 "addr": self._addr,
                 "uid": self._uid,
-                "saved_temp": self._saved_settings.get("temp"),
-                "saved_mode": self._saved_settings.get("mode"),
-                "saved_fan": self._saved_settings.get("fan"),
+                "saved_temp": saved.get("temp"),
+                "saved_mode": saved.get("mode"),
+                "saved_fan": saved.get("fan"),
             })
         
-        return attrs
+        self._attr_extra_state_attributes = attrs
+    
+    def _target_command(self):
+        """Состояние (onoff, mode, fan, temp), к которому придет блок после уже принятых команд.
+        
+        None - состояние блока неизвестно.
+        """
+        if self._pending is not None:
+            return self._pending
+        if self._sending is not None:
+            return self._sending
+        return self._reported
+    
+    async def _send(self, onoff=None, mode=None, fan=None, temp=None):
+        """Отправляет команду блоку; None - оставить значение из целевого состояния.
+        
+        Изменения накладываются на целевое состояние, поэтому вызов, пришедший во время
+        отправки, не отменяет предыдущие. Команда, совпадающая с последним известным
+        состоянием блока, не отправляется.
+        """
+        base = self._target_command() or (
+            self._power, self._mode_code, self._fan_code, self._set_temp
+        )
+        command = tuple(
+            old if new is None else new
+            for old, new in zip(base, (onoff, mode, fan, temp))
+        )
+        
+        if self._pending is not None:
+            # Команда еще ждет очереди - дополняем ее, результат отправки будет общим
+            self._pending = command
+            return await asyncio.shield(self._pending_future)
+        
+        if self._sending is None and command == self._reported:
+            _LOGGER.debug("Device %s already in state %s, command skipped", self._uid, command)
+            return True
+        
+        future = self.hass.loop.create_future()
+        self._pending = command
+        self._pending_future = future
+        try:
+            async with self._send_lock:
+                # Пока ждали очереди, команду могли дополнить другие вызовы
+                command = self._pending
+                self._pending = self._pending_future = None
+                
+                if command == self._reported:
+                    _LOGGER.debug("Device %s already in state %s, command skipped",
+                                  self._uid, command)
+                    success = True
+                else:
+                    self._sending = command
+                    try:
+                        success = await self._set_idu(
+                            **self._addr_kwargs,
+                            onoff=command[0],
+                            mode=command[1],
+                            fan=command[2],
+                            temp=command[3]
+                        )
+                    finally:
+                        self._sending = None
+                    
+                    if success:
+                        self._reported = command
+                        self._apply_optimistic(command)
+                
+                future.set_result(success)
+                return success
+        finally:
+            if self._pending_future is future:
+                # Вызов отменен до отправки - команда не ушла
+                self._pending = self._pending_future = None
+            if not future.done():
+                future.set_result(False)
+    
+    @callback
+    def _apply_optimistic(self, command):
+        """Применяет принятую блоком команду к данным координатора без опроса хаба.
+        
+        Фактическое состояние подтвердит следующий плановый опрос.
+        """
+        data = self.coordinator.data
+        unit = data.get(self._uid) if data else None
+        if not unit:
+            # Блока нет в данных - запускаем обычное обновление, не дожидаясь его
+            self.hass.async_create_task(
+                self.coordinator.async_request_refresh(),
+                name=f"{DOMAIN}_refresh_{self._uid}",
+                eager_start=True,
+            )
+            return
+        
+        onoff, mode, fan, temp = command
+        unit = {
+            **unit,
+            "power": onoff,
+            "mode_code": mode,
+            "mode": MODE_MAP.get(mode, "cool"),
+            "fan_code": fan,
+            "fan": FAN_MAP.get(fan, unit.get("fan")),
+            "set_temp": temp,
+        }
+        # Статусы alarm/offline оставляем до следующего опроса
+        if unit.get("status") in ("on", "off"):
+            unit["status"] = "on" if onoff == 1 else "off"
+        self.coordinator.async_set_updated_data({**data, self._uid: unit})
     
     async def async_set_temperature(self, **kwargs):
         """Установить целевую температуру."""
         temperature = kwargs.get(ATTR_TEMPERATURE)
-        if temperature is None:
+        hvac_mode = kwargs.get(ATTR_HVAC_MODE)
+        if temperature is None and hvac_mode is None:
             return
         
-        # Сохраняем температуру в сохраненные настройки
-        self._saved_settings["temp"] = int(temperature)
+        target = self._target_command()
+        if temperature is not None:
+            # Приводим к целому один раз: шаг температуры устройства - 1 °C
+            temperature = int(temperature)
+            if (hvac_mode is None and target is not None and temperature == target[3]
+                    and temperature == self._saved_settings["temp"]):
+                _LOGGER.debug("Device %s already at %s°C, skipped", self._uid, temperature)
+                return
+            
+            # Сохраняем температуру в сохраненные настройки
+            self._saved_settings["temp"] = temperature
+            self._refresh_extra_attrs()
+            
+            # Обновляем отображаемое значение до ответа блока
+            self._attr_target_temperature = temperature
+            self._written_state = None
         
-        # Обновляем локальный кэш для отображения в интерфейсе
-        self._current_data["set_temp"] = int(temperature)
+        if hvac_mode is not None:
+            # Режим и температура в одном вызове - одна команда вместо двух
+            await self._set_hvac_mode(hvac_mode)
+            return
         
-        # Отправляем команду на устройство ТОЛЬКО если оно включено
-        if self._current_data.get("power", 0) == 1:
-            success = await self._client.set_idu(
-                sys=self._sys,
-                addr=self._addr,
-                onoff=1,
-                mode=self._current_data.get("mode_code", MODE_COOL),
-                fan=self._current_data.get("fan_code", 4),
-                temp=int(temperature)
-            )
+        # Отправляем команду на устройство ТОЛЬКО если оно включено (или включается)
+        if target is not None and target[0] == 1:
+            success = await self._send(temp=temperature)
             
             if success:
                 _LOGGER.debug("Temperature set successfully for %s to %s°C", self._uid, temperature)
-                # Запрашиваем обновление от координатора
-                await self.coordinator.async_request_refresh()
             else:
                 _LOGGER.error("Failed to set temperature for %s", self._uid)
         else:
@@ -220,79 +406,64 @@ class HisenseIDUClimate(CoordinatorEntity, ClimateEntity):
     
     async def async_set_hvac_mode(self, hvac_mode):
         """Установить режим HVAC."""
-        if hvac_mode == HVACMode.OFF:
-            # Выключить устройство, сохраняя текущие настройки
-            success = await self._client.set_idu(
-                sys=self._sys,
-                addr=self._addr,
-                onoff=0,
-                mode=self._saved_settings.get("mode", MODE_COOL),
-                fan=self._saved_settings.get("fan", 4),
-                temp=self._saved_settings.get("temp", 24)  # Сохраняем последнюю температуру
-            )
-            if success:
-                _LOGGER.debug("Device %s turned off with saved settings", self._uid)
-                await self.coordinator.async_request_refresh()
+        # Блок уже в этом режиме (или переводится в него) - повторная команда не нужна
+        target = self._target_command()
+        if target is not None and hvac_mode == (
+            MODE_CODE_TO_HVAC.get(target[1], HVACMode.COOL) if target[0] else HVACMode.OFF
+        ):
+            _LOGGER.debug("Device %s already in mode %s, skipped", self._uid, hvac_mode)
+            return
+        
+        await self._set_hvac_mode(hvac_mode)
+    
+    async def _set_hvac_mode(self, hvac_mode):
+        """Отправляет режим HVAC с сохраненными температурой и скоростью."""
+        saved = self._saved_settings
+        onoff, mode_code = HVAC_DISPATCH.get(hvac_mode, (1, self._DEFAULT_MODE))
+        if mode_code is None:
+            # Выключение - сохраняем текущий режим для следующего включения
+            mode_code = saved["mode"]
         else:
-            # Включить устройство с нужным режимом
-            
-            # Преобразуем HVACMode в режим устройства
-            device_mode = HVAC_TO_DEVICE.get(hvac_mode, "cool")
-            mode_code = MODE_REVERSE_MAP.get(device_mode, MODE_COOL)
-            
-            # Сохраняем режим
-            self._saved_settings["mode"] = mode_code
-            
-            # Используем сохраненную температуру
-            current_temp = self._saved_settings.get("temp", 24)
-            fan_code = self._saved_settings.get("fan", 4)
-            
-            success = await self._client.set_idu(
-                sys=self._sys,
-                addr=self._addr,
-                onoff=1,
-                mode=mode_code,
-                fan=fan_code,
-                temp=int(current_temp)
-            )
-            
-            if success:
-                _LOGGER.debug("Device %s turned on with mode %s, temp %s", 
-                            self._uid, hvac_mode, current_temp)
-                await self.coordinator.async_request_refresh()
-            else:
-                _LOGGER.error("Failed to set HVAC mode for %s", self._uid)
+            saved["mode"] = mode_code
+            self._refresh_extra_attrs()
+            self._written_state = None
+        
+        # Используем сохраненные температуру и скорость вентилятора
+        current_temp = saved["temp"]
+        fan_code = saved["fan"]
+        
+        success = await self._send(onoff, mode_code, fan_code, current_temp)
+        
+        if success:
+            _LOGGER.debug("Device %s set to %s, mode_code %s, temp %s", 
+                        self._uid, hvac_mode, mode_code, current_temp)
+        else:
+            _LOGGER.error("Failed to set HVAC mode for %s", self._uid)
     
     async def async_set_fan_mode(self, fan_mode):
         """Установить скорость вентилятора."""
         # Преобразуем строку в код устройства (только основные скорости)
-        fan_code = FAN_REVERSE_MAP.get(fan_mode, 4)
+        fan_code = FAN_REVERSE_MAP.get(fan_mode, self._DEFAULT_FAN)
+        target = self._target_command()
+        if (target is not None and fan_code == target[2]
+                and fan_code == self._saved_settings["fan"]):
+            _LOGGER.debug("Device %s already at fan %s, skipped", self._uid, fan_mode)
+            return
         
         # Сохраняем скорость
         self._saved_settings["fan"] = fan_code
+        self._refresh_extra_attrs()
         
-        # Обновляем локальный кэш
-        self._current_data["fan_code"] = fan_code
-        self._current_data["fan"] = fan_mode
+        # Обновляем отображаемое значение до ответа блока
+        self._attr_fan_mode = fan_mode
+        self._written_state = None
         
-        # Отправляем команду на устройство ТОЛЬКО если оно включено
-        if self._current_data.get("power", 0) == 1:
-            # Используем параметры из текущих данных
-            mode_code = self._current_data.get("mode_code", MODE_COOL)
-            current_temp = self._current_data.get("set_temp", 24)
-            
-            success = await self._client.set_idu(
-                sys=self._sys,
-                addr=self._addr,
-                onoff=1,
-                mode=mode_code,
-                fan=fan_code,
-                temp=int(current_temp)
-            )
+        # Отправляем команду на устройство ТОЛЬКО если оно включено (или включается)
+        if target is not None and target[0] == 1:
+            success = await self._send(fan=fan_code)
             
             if success:
                 _LOGGER.debug("Fan mode set successfully for %s to %s", self._uid, fan_mode)
-                await self.coordinator.async_request_refresh()
             else:
                 _LOGGER.error("Failed to set fan mode for %s", self._uid)
         else:
@@ -303,38 +474,49 @@ class HisenseIDUClimate(CoordinatorEntity, ClimateEntity):
     
     async def async_turn_on(self):
         """Включить кондиционер с сохраненными настройками."""
+        target = self._target_command()
+        if target is not None and target[0] == 1:
+            _LOGGER.debug("Device %s already on, skipped", self._uid)
+            return
+        
         # Используем сохраненные настройки
-        mode_code = self._saved_settings.get("mode", MODE_COOL)
-        fan_code = self._saved_settings.get("fan", 4)
-        current_temp = self._saved_settings.get("temp", 24)
+        saved = self._saved_settings
+        mode_code = saved["mode"]
+        fan_code = saved["fan"]
+        current_temp = saved["temp"]
         
-        success = await self._client.set_idu(
-            sys=self._sys,
-            addr=self._addr,
-            onoff=1,
-            mode=mode_code,
-            fan=fan_code,
-            temp=int(current_temp)
-        )
+        success = await self._send(1, mode_code, fan_code, current_temp)
         
         if success:
             _LOGGER.debug("Device %s turned on with saved settings", self._uid)
-            await self.coordinator.async_request_refresh()
     
     async def async_turn_off(self):
         """Выключить кондиционер, сохраняя настройки."""
-        success = await self._client.set_idu(
-            sys=self._sys,
-            addr=self._addr,
-            onoff=0,
-            mode=self._saved_settings.get("mode", MODE_COOL),
-            fan=self._saved_settings.get("fan", 4),
-            temp=self._saved_settings.get("temp", 24)  # Сохраняем последнюю температуру
+        target = self._target_command()
+        if target is not None and target[0] == 0:
+            _LOGGER.debug("Device %s already off, skipped", self._uid)
+            return
+        
+        saved = self._saved_settings
+        # Выключаем, сохраняя последние настройки блока
+        success = await self._send(
+            0, saved["mode"], saved["fan"], saved["temp"]
         )
         
         if success:
             _LOGGER.debug("Device %s turned off with saved settings", self._uid)
-            await self.coordinator.async_request_refresh()
+
+def _unit_device_info(base_device_info, unit_data):
+    """Возвращает device_info блока: общий словарь хаба, дополненный зоной.
+    
+    "name" не трогаем. Без зоны все блоки используют общий словарь хаба,
+    поэтому он и словари с зоной доступны только для чтения.
+    """
+    suggested_area = next((unit_data[k] for k in AREA_KEYS if unit_data.get(k)), None)
+    if suggested_area:
+        return MappingProxyType({**base_device_info, "suggested_area": suggested_area})
+    return base_device_info
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up climate entities."""
@@ -348,54 +530,44 @@ async def async_setup_entry(hass, entry, async_add_entities):
     # ФИКСИРОВАННОЕ ИМЯ УСТРОЙСТВА (Device) - это изменит название устройства в HA
     hub_device_name = f"Hisense Multi-IDU Hub ({host})"
     
+    # Идентификатор хаба создаем один раз и используем во всех сущностях
+    hub_id = (DOMAIN, host)
+    
     # Базовая информация об устройстве (Device)
-    base_device_info = {
-        "identifiers": {(DOMAIN, host)},
+    base_device_info = MappingProxyType({
+        "identifiers": {hub_id},
         "name": hub_device_name,  # ФИКСИРОВАННОЕ имя устройства
         "manufacturer": "Hisense",
         "model": "Multi-IDU Hub",
-        "configuration_url": f"http://{host}"
-    }
+        "configuration_url": f"http://{host}",
+    })
     
     # Создаем сущности для каждого кондиционера
     coordinator_data = coordinator.data
-    _LOGGER.info("Setting up climate entities. Coordinator data type: %s", 
-                 type(coordinator_data))
+    _LOGGER.debug("Setting up climate entities. Coordinator data type: %s", 
+                  type(coordinator_data))
     
     if isinstance(coordinator_data, dict) and coordinator_data:
-        for uid, unit_data in coordinator_data.items():
-            _LOGGER.debug("Processing device UID: %s", uid)
-            
-            if not unit_data:
-                _LOGGER.warning("Empty data for device %s, skipping", uid)
-                continue
-            
-            # Получаем оригинальное имя объекта (Entity) из данных устройства
-            original_name = unit_data.get("name", f"IDU {uid}")
-            
-            # Создаем информацию об устройстве для этого блока
-            entity_device_info = base_device_info.copy()
-            
-            # Добавляем дополнительную информацию, НЕ ТРОГАЯ "name"
-            suggested_area = unit_data.get("pppname") or unit_data.get("ppname") or unit_data.get("pname")
-            if suggested_area:
-                entity_device_info["suggested_area"] = suggested_area
-            
-            entity_device_info.update({
-                "via_device": (DOMAIN, host),
-            })
-            
-            # Создаем объект с оригинальным именем (Entity), но с device_info хаба
-            entities.append(HisenseIDUClimate(
-                coordinator, client, uid, entity_device_info, entity_name=original_name
-            ))
-            _LOGGER.info("Created climate entity for %s with name: %s", uid, original_name)
+        # Объект с оригинальным именем (Entity) из данных устройства, но с device_info хаба.
+        # Блоки без данных пропускаются до создания сущности
+        entities = [
+            HisenseIDUClimate(
+                coordinator, client, uid,
+                _unit_device_info(base_device_info, unit_data),
+                entity_name=unit_data.get("name", f"IDU {uid}"),
+            )
+            for uid, unit_data in coordinator_data.items()
+            if unit_data
+        ]
+        skipped = len(coordinator_data) - len(entities)
+        if skipped:
+            _LOGGER.warning("Skipped %s devices with empty data", skipped)
     else:
         _LOGGER.warning("No valid data in coordinator. Type: %s", 
                        type(coordinator_data))
     
     if entities:
-        async_add_entities(entities, update_before_add=True)
+        async_add_entities(entities)
         _LOGGER.info("Successfully created %s climate entities. Hub name: %s", 
                     len(entities), hub_device_name)
     else:
@@ -8,6 +8,12 @@ CONF_HOST = "host"
 DEFAULT_SCAN_INTERVAL_CLIMATE = 10
 DEFAULT_SCAN_INTERVAL_SENSOR = 30
 
+# Задержка (секунды) для объединения запросов обновления после команд
+REQUEST_REFRESH_DELAY = 0.35
+
+# Поля топологии для suggested_area, от самого точного к общему
+AREA_KEYS = ("pppname", "ppname", "pname")
+
 # Индексы данных в массиве data[]
 DATA_ONOFF = 28      # Состояние вкл/выкл (0=OFF, 1=ON)
 DATA_MODE = 29       # Режим работы
@@ -62,6 +68,12 @@ FAN_MAP = {
 
 FAN_REVERSE_MAP = {v: k for k, v in FAN_MAP.items()}
 
+# Дополнительные скорости вентилятора, отображаемые как "high"
+FAN_EXTRA_HIGH_CODES = frozenset({16, 32, 64})
+
+# Коды ошибок, означающие потерю связи с блоком (статус "offline")
+OFFLINE_ERROR_CODES = frozenset({60, 61, 64, 65})
+
 
 
 
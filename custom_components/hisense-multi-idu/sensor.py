@@ -1,17 +1,28 @@
 """Sensor platform for Hisense Multi-IDU (energy meter like in YAML)."""
 import logging
+import time
 from homeassistant.components.sensor import (
     SensorEntity, 
     SensorDeviceClass, 
     SensorStateClass
 )
 from homeassistant.const import UnitOfEnergy, UnitOfPower
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def _to_float(data):
+    """Convert a meter reading to float, or None if it is not numeric."""
+    try:
+        return float(data)
+    except (ValueError, TypeError):
+        return None
+
+
 class HisenseRawMeter(CoordinatorEntity, SensorEntity):
     """Raw sensor from Hisense (like in YAML)."""
     
@@ -32,37 +43,30 @@ class HisenseRawMeter(CoordinatorEntity, SensorEntity):
             "model": "Multi-IDU Hub",
             "configuration_url": f"http://{ip}"
         }
+        self._refresh_value()
 
     @property
     def available(self):
         """Return True if sensor data is available."""
         return bool(self.coordinator.last_update_success and self.coordinator.data is not None)
 
-    @property
-    def native_value(self):
-        """Return the raw power value."""
-        data = self.coordinator.data
-        
-        if data is None:
-            return None
-        
-        try:
-            # Возвращаем значение как есть (в ватт-часах)
-            return float(data)
-        except (ValueError, TypeError):
-            return data
-
-    @property
-    def extra_state_attributes(self):
-        """Return additional attributes."""
+    def _refresh_value(self):
+        """Compute the state once per coordinator update."""
         data = self.coordinator.data
-        attrs = {
+        value = _to_float(data)
+        # Возвращаем значение как есть (в ватт-часах)
+        self._attr_native_value = value if value is not None else data
+        self._attr_extra_state_attributes = {
             "data_source": "Hisense Multi-IDU Raw Meter",
             "status": "online" if data is not None else "offline",
             "ip_address": self._ip,
         }
-        
-        return attrs
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._refresh_value()
+        super()._handle_coordinator_update()
 
 
 class HisenseEnergyMeter(CoordinatorEntity, SensorEntity):
@@ -88,48 +92,41 @@ class HisenseEnergyMeter(CoordinatorEntity, SensorEntity):
             "model": "Multi-IDU Hub",
             "configuration_url": f"http://{ip}"
         }
+        self._refresh_value()
 
     @property
     def available(self):
         """Return True if sensor data is available."""
         return bool(self.coordinator.last_update_success and self.coordinator.data is not None)
 
-    @property
-    def native_value(self):
-        """Return the energy value in kWh."""
-        data = self.coordinator.data
-        
-        if data is None:
-            return None
-        
-        try:
-            # Конвертируем ватт-часы в киловатт-часы
-            # Как в YAML: (pwr / 1000)
-            power_wh = float(data)
-            power_kwh = power_wh / 1000.0
-            return round(power_kwh, 2)
-            
-        except (ValueError, TypeError):
-            return None
-
-    @property
-    def extra_state_attributes(self):
-        """Return additional attributes."""
+    def _refresh_value(self):
+        """Compute the state once per coordinator update."""
         data = self.coordinator.data
+        power_wh = _to_float(data)
         attrs = {
             "data_source": "Hisense Multi-IDU",
             "status": "online" if data is not None else "offline",
             "ip_address": self._ip,
         }
         
-        if data is not None:
-            try:
-                attrs["raw_value_wh"] = float(data)
-                attrs["raw_value_kwh"] = round(float(data) / 1000, 3)
-            except (ValueError, TypeError):
+        if power_wh is not None:
+            # Конвертируем ватт-часы в киловатт-часы
+            # Как в YAML: (pwr / 1000)
+            self._attr_native_value = round(power_wh / 1000.0, 2)
+            attrs["raw_value_wh"] = power_wh
+            attrs["raw_value_kwh"] = round(power_wh / 1000, 3)
+        else:
+            self._attr_native_value = None
+            if data is not None:
                 attrs["raw_value"] = data
         
-        return attrs
+        self._attr_extra_state_attributes = attrs
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._refresh_value()
+        super()._handle_coordinator_update()
 
 
 class HisensePowerSensor(CoordinatorEntity, SensorEntity):
@@ -160,24 +157,19 @@ class HisensePowerSensor(CoordinatorEntity, SensorEntity):
         self._last_energy = None
         self._last_update_time = None
         self._current_power = 0.0
+        self._refresh_value()
 
     @property
     def available(self):
         """Return True if sensor data is available."""
         return bool(self.coordinator.last_update_success and self.coordinator.data is not None)
 
-    @property
-    def native_value(self):
-        """Return the current power in kW."""
-        import time
-        
+    def _refresh_value(self):
+        """Recalculate power once per coordinator update."""
         data = self.coordinator.data
+        current_energy = _to_float(data)  # текущая энергия в ватт-часах
         
-        if data is None:
-            return round(self._current_power, 3)
-        
-        try:
-            current_energy = float(data)  # текущая энергия в ватт-часах
+        if current_energy is not None:
             current_time = time.time()
             
             if self._last_energy is not None and self._last_update_time is not None:
@@ -200,18 +192,9 @@ class HisensePowerSensor(CoordinatorEntity, SensorEntity):
             # Обновляем предыдущие значения
             self._last_energy = current_energy
             self._last_update_time = current_time
-            
-            return round(self._current_power, 3)
-            
-        except (ValueError, TypeError):
-            return round(self._current_power, 3)
-
-    @property
-    def extra_state_attributes(self):
-        """Return additional attributes."""
-        import time
         
-        data = self.coordinator.data
+        self._attr_native_value = round(self._current_power, 3)
+        
         attrs = {
             "data_source": "Hisense Multi-IDU Power Calculation",
             "status": "online" if data is not None else "offline",
@@ -219,14 +202,19 @@ class HisensePowerSensor(CoordinatorEntity, SensorEntity):
             "calculated_power_kw": round(self._current_power, 3),
         }
         
-        if data is not None:
-            try:
-                attrs["current_energy_wh"] = float(data)
-                attrs["current_energy_kwh"] = round(float(data) / 1000, 3)
-            except (ValueError, TypeError):
-                attrs["current_energy"] = data
+        if current_energy is not None:
+            attrs["current_energy_wh"] = current_energy
+            attrs["current_energy_kwh"] = round(current_energy / 1000, 3)
+        elif data is not None:
+            attrs["current_energy"] = data
         
-        return attrs
+        self._attr_extra_state_attributes = attrs
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._refresh_value()
+        super()._handle_coordinator_update()
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
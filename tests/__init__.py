@@ -0,0 +1 @@
+"""Tests for the Hisense Multi-IDU integration."""
@@ -0,0 +1,80 @@
+"""Tests for polling indoor units through HisenseClient."""
+import importlib
+
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+integration = importlib.import_module("custom_components.hisense-multi-idu")
+
+HOST = "192.0.2.10"
+MISCDATA_URL = f"http://{HOST}/cgi/get_miscdata.shtml"
+IDU_DATA_URL = f"http://{HOST}/cgi/get_idu_data.shtml"
+
+TOPO = [
+    {"type": "IDU", "sysAdr": 1, "address": "1", "name": "Кухня"},
+    {"type": "IDU", "sysAdr": 1, "address": "2", "name": "Спальня"},
+    {"type": "ODU", "sysAdr": 1, "address": "0"},
+]
+
+
+def _raw_data(power=1, temp=24):
+    data = [0] * 40
+    data[28], data[29], data[30], data[31], data[39] = power, 2, 4, temp, 23
+    return data
+
+
+def _mock_device(aioclient_mock, dats):
+    aioclient_mock.post(
+        MISCDATA_URL, json={"status": "success", "miscdata": {"topo": TOPO}}
+    )
+    aioclient_mock.post(IDU_DATA_URL, json={"status": "success", "dats": dats})
+
+
+def _requested_devs(aioclient_mock):
+    return [
+        call[2]["devs"] for call in aioclient_mock.mock_calls
+        if str(call[1]) == IDU_DATA_URL
+    ]
+
+
+async def test_get_idu_data_polls_all_units(hass, aioclient_mock):
+    _mock_device(aioclient_mock, [
+        {"sys": 1, "addr": "1", "data": _raw_data()},
+        {"sys": 1, "addr": "2", "data": _raw_data(power=0, temp=26)},
+    ])
+    client = integration.HisenseClient(HOST, async_create_clientsession(hass))
+
+    data = await client.get_idu_data()
+
+    assert _requested_devs(aioclient_mock) == [
+        [{"sys": 1, "addr": "1"}, {"sys": 1, "addr": "2"}]
+    ]
+    assert set(data) == {"S1_1", "S1_2"}
+    assert data["S1_1"]["name"] == "Кухня"
+    assert data["S1_2"]["power"] == 0
+    assert data["S1_2"]["set_temp"] == 26
+    assert not client.idu_poll_skipped
+
+
+async def test_get_idu_data_skips_excluded_units(hass, aioclient_mock):
+    _mock_device(aioclient_mock, [{"sys": 1, "addr": "2", "data": _raw_data()}])
+    client = integration.HisenseClient(HOST, async_create_clientsession(hass))
+
+    data = await client.get_idu_data(exclude=frozenset({"S1_1"}))
+
+    assert _requested_devs(aioclient_mock) == [[{"sys": 1, "addr": "2"}]]
+    assert set(data) == {"S1_2"}
+    assert not client.idu_poll_skipped
+
+
+async def test_get_idu_data_all_units_excluded(hass, aioclient_mock):
+    _mock_device(aioclient_mock, [{"sys": 1, "addr": "1", "data": _raw_data()}])
+    client = integration.HisenseClient(HOST, async_create_clientsession(hass))
+    await client.get_idu_data()
+
+    data = await client.get_idu_data(exclude=frozenset({"S1_1", "S1_2"}))
+
+    assert data == {}
+    assert client.idu_poll_skipped
+    assert len(_requested_devs(aioclient_mock)) == 1
+    # Кэш очищен: при ошибке опроса не вернутся данные отключенных блоков
+    assert client._last_idu_data == {}
@@ -0,0 +1,169 @@
+"""Tests for sending commands from the climate entity."""
+import asyncio
+import importlib
+import logging
+from unittest.mock import Mock
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+climate = importlib.import_module("custom_components.hisense-multi-idu.climate")
+const = importlib.import_module("custom_components.hisense-multi-idu.const")
+
+UID = "S1_5"
+
+
+class GatedSetIdu:
+    """set_idu, который отвечает только после release()."""
+
+    def __init__(self, *results):
+        self.calls = []
+        self._results = list(results)
+        self._release = asyncio.Event()
+
+    async def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        await self._release.wait()
+        return self._results.pop(0) if self._results else True
+
+    def release(self):
+        self._release.set()
+
+
+def _unit(power=1, mode=const.MODE_COOL, fan=const.FAN_MID, temp=24):
+    return {
+        "power": power,
+        "mode_code": mode,
+        "fan_code": fan,
+        "set_temp": temp,
+        "room_temp": 23,
+        "status": "on" if power else "off",
+    }
+
+
+def _command(call):
+    return call["onoff"], call["mode"], call["fan"], call["temp"]
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _make_entity(hass, set_idu, unit):
+    coordinator = DataUpdateCoordinator(hass, logging.getLogger(__name__), name="test")
+    coordinator.data = {UID: unit}
+    client = Mock(set_idu=set_idu)
+    entity = climate.HisenseIDUClimate(coordinator, client, UID, {}, entity_name="Test")
+    entity.hass = hass
+    entity.entity_id = "climate.test"
+    return entity
+
+
+async def test_send_skips_command_matching_reported_state(hass):
+    set_idu = GatedSetIdu()
+    entity = _make_entity(hass, set_idu, _unit(temp=24))
+
+    assert await entity._send(temp=24) is True
+    assert set_idu.calls == []
+
+
+async def test_send_merges_queued_commands(hass):
+    set_idu = GatedSetIdu()
+    entity = _make_entity(hass, set_idu, _unit())
+
+    first = hass.async_create_task(entity._send(temp=25))
+    await _settle()
+    second = hass.async_create_task(entity._send(mode=const.MODE_HEAT))
+    third = hass.async_create_task(entity._send(temp=22))
+    await _settle()
+    set_idu.release()
+
+    assert await asyncio.gather(first, second, third) == [True, True, True]
+    assert [_command(call) for call in set_idu.calls] == [
+        (1, const.MODE_COOL, const.FAN_MID, 25),
+        (1, const.MODE_HEAT, const.FAN_MID, 22),
+    ]
+    assert entity.coordinator.data[UID]["mode_code"] == const.MODE_HEAT
+    assert entity.coordinator.data[UID]["set_temp"] == 22
+
+
+async def test_send_keeps_revert_issued_during_send(hass):
+    set_idu = GatedSetIdu()
+    entity = _make_entity(hass, set_idu, _unit(temp=24))
+
+    first = hass.async_create_task(entity._send(temp=25))
+    await _settle()
+    second = hass.async_create_task(entity._send(temp=24))
+    await _settle()
+    set_idu.release()
+
+    assert await asyncio.gather(first, second) == [True, True]
+    assert [call["temp"] for call in set_idu.calls] == [25, 24]
+
+
+async def test_send_reports_failure_to_merged_callers(hass):
+    set_idu = GatedSetIdu(True, False)
+    entity = _make_entity(hass, set_idu, _unit())
+
+    first = hass.async_create_task(entity._send(temp=25))
+    await _settle()
+    second = hass.async_create_task(entity._send(temp=26))
+    third = hass.async_create_task(entity._send(fan=const.FAN_LOW))
+    await _settle()
+    set_idu.release()
+
+    assert await asyncio.gather(first, second, third) == [True, False, False]
+    assert len(set_idu.calls) == 2
+
+
+async def test_send_cancelled_before_sending_reports_failure(hass):
+    set_idu = GatedSetIdu()
+    entity = _make_entity(hass, set_idu, _unit())
+
+    first = hass.async_create_task(entity._send(temp=25))
+    await _settle()
+    second = hass.async_create_task(entity._send(temp=26))
+    third = hass.async_create_task(entity._send(temp=27))
+    await _settle()
+    second.cancel()
+    await _settle()
+    set_idu.release()
+
+    assert await first is True
+    assert await third is False
+    assert [call["temp"] for call in set_idu.calls] == [25]
+
+
+async def test_hvac_mode_then_temperature_keeps_mode(hass):
+    set_idu = GatedSetIdu()
+    entity = _make_entity(hass, set_idu, _unit())
+
+    first = hass.async_create_task(entity.async_set_fan_mode("high"))
+    await _settle()
+    second = hass.async_create_task(entity.async_set_hvac_mode(HVACMode.HEAT))
+    third = hass.async_create_task(entity.async_set_temperature(temperature=22))
+    await _settle()
+    set_idu.release()
+    await asyncio.gather(first, second, third)
+
+    assert _command(set_idu.calls[-1]) == (
+        1, const.MODE_HEAT, const.FAN_HIGH, 22
+    )
+
+
+async def test_setter_after_turn_off_keeps_unit_off(hass):
+    set_idu = GatedSetIdu()
+    entity = _make_entity(hass, set_idu, _unit())
+
+    first = hass.async_create_task(entity.async_set_temperature(temperature=25))
+    await _settle()
+    second = hass.async_create_task(entity.async_turn_off())
+    await _settle()
+    await entity.async_set_temperature(temperature=20)
+    set_idu.release()
+    await asyncio.gather(first, second)
+
+    assert [call["onoff"] for call in set_idu.calls] == [1, 0]
+    assert entity.coordinator.data[UID]["power"] == 0
+    assert entity._saved_settings["temp"] == 20
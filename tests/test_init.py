@@ -0,0 +1,84 @@
+"""Tests for setting up the Hisense Multi-IDU config entry."""
+import importlib
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import entity_registry as er
+
+integration = importlib.import_module("custom_components.hisense-multi-idu")
+const = importlib.import_module("custom_components.hisense-multi-idu.const")
+
+HOST = "192.0.2.10"
+
+TOPO = [
+    {"type": "IDU", "sysAdr": 1, "address": "1", "name": "Кухня"},
+    {"type": "IDU", "sysAdr": 1, "address": "2", "name": "Спальня"},
+]
+
+
+def _raw_data():
+    data = [0] * 40
+    data[28], data[29], data[30], data[31], data[39] = 1, 2, 4, 24, 23
+    return data
+
+
+def _add_entry(hass):
+    entry = MockConfigEntry(domain=const.DOMAIN, data={"host": HOST})
+    entry.add_to_hass(hass)
+    return entry
+
+
+def _add_climate_entity(hass, entry, uid, disabled=False):
+    return er.async_get(hass).async_get_or_create(
+        "climate", const.DOMAIN, f"{const.DOMAIN}_{uid}",
+        config_entry=entry,
+        disabled_by=er.RegistryEntryDisabler.USER if disabled else None,
+    )
+
+
+async def test_unreachable_controller_with_disabled_unit_not_ready(hass):
+    entry = _add_entry(hass)
+    _add_climate_entity(hass, entry, "S1_1", disabled=True)
+    _add_climate_entity(hass, entry, "S1_2")
+
+    with patch.object(
+        integration.HisenseClient, "get_miscdata", AsyncMock(return_value=None)
+    ), patch.object(
+        integration.HisenseClient, "get_power_data", AsyncMock(return_value=None)
+    ), pytest.raises(ConfigEntryNotReady):
+        await integration.async_setup_entry(hass, entry)
+
+
+async def test_poll_skips_unit_disabled_after_setup(hass):
+    entry = _add_entry(hass)
+    kitchen = _add_climate_entity(hass, entry, "S1_1")
+    _add_climate_entity(hass, entry, "S1_2")
+    request_idu_dats = AsyncMock(side_effect=lambda devs: [
+        {"sys": dev["sys"], "addr": dev["addr"], "data": _raw_data()} for dev in devs
+    ])
+
+    with patch.object(
+        integration.HisenseClient, "get_miscdata",
+        AsyncMock(return_value={"topo": TOPO}),
+    ), patch.object(
+        integration.HisenseClient, "_request_idu_dats", request_idu_dats
+    ), patch.object(
+        integration.HisenseClient, "get_power_data", AsyncMock(return_value="1000")
+    ), patch.object(
+        hass.config_entries, "async_forward_entry_setups", AsyncMock()
+    ):
+        assert await integration.async_setup_entry(hass, entry)
+        data = hass.data[const.DOMAIN][entry.entry_id]
+
+        # Отключение сущности не перезагружает запись - набор читается при опросе
+        er.async_get(hass).async_update_entity(
+            kitchen.entity_id, disabled_by=er.RegistryEntryDisabler.USER
+        )
+        await data["coordinator_climate"].async_refresh()
+
+    assert request_idu_dats.await_args_list[-1].args[0] == [{"sys": 1, "addr": "2"}]
+    assert set(data["coordinator_climate"].data) == {"S1_2"}
+    await data["client"]._session.close()
@@ -0,0 +1,85 @@
+"""Tests for the meter sensors."""
+from datetime import timedelta
+import importlib
+import logging
+
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+sensor = importlib.import_module("custom_components.hisense-multi-idu.sensor")
+
+HOST = "192.0.2.10"
+
+
+def _coordinator(hass, data):
+    coordinator = DataUpdateCoordinator(hass, logging.getLogger(__name__), name="test")
+    coordinator.data = data
+    return coordinator
+
+
+async def test_raw_meter_numeric_value(hass):
+    entity = sensor.HisenseRawMeter(_coordinator(hass, "12345.5"), HOST)
+
+    assert entity.native_value == 12345.5
+    assert entity.extra_state_attributes["status"] == "online"
+
+
+async def test_raw_meter_keeps_non_numeric_value(hass):
+    entity = sensor.HisenseRawMeter(_coordinator(hass, "error"), HOST)
+
+    assert entity.native_value == "error"
+
+
+async def test_raw_meter_without_data(hass):
+    entity = sensor.HisenseRawMeter(_coordinator(hass, None), HOST)
+
+    assert entity.native_value is None
+    assert entity.extra_state_attributes["status"] == "offline"
+    assert not entity.available
+
+
+async def test_energy_meter_converts_to_kwh(hass):
+    entity = sensor.HisenseEnergyMeter(_coordinator(hass, 12340), HOST)
+
+    assert entity.native_value == 12.34
+    assert entity.extra_state_attributes["raw_value_wh"] == 12340.0
+    assert entity.extra_state_attributes["raw_value_kwh"] == 12.34
+
+
+async def test_energy_meter_non_numeric_value(hass):
+    entity = sensor.HisenseEnergyMeter(_coordinator(hass, "error"), HOST)
+
+    assert entity.native_value is None
+    assert entity.extra_state_attributes["raw_value"] == "error"
+    assert "raw_value_wh" not in entity.extra_state_attributes
+
+
+async def test_power_sensor_from_energy_difference(hass, freezer):
+    coordinator = _coordinator(hass, 10000)
+    entity = sensor.HisensePowerSensor(coordinator, HOST)
+    assert entity.native_value == 0
+
+    freezer.tick(timedelta(hours=1))
+    coordinator.data = 11500
+    entity._refresh_value()
+    assert entity.native_value == 1.5
+
+    freezer.tick(timedelta(hours=1))
+    coordinator.data = 12500
+    entity._refresh_value()
+    # Сглаживание: 0.7 * 1.5 + 0.3 * 1.0
+    assert entity.native_value == 1.35
+    assert entity.extra_state_attributes["current_energy_kwh"] == 12.5
+
+
+async def test_power_sensor_keeps_power_without_reading(hass, freezer):
+    coordinator = _coordinator(hass, 10000)
+    entity = sensor.HisensePowerSensor(coordinator, HOST)
+    freezer.tick(timedelta(hours=1))
+    coordinator.data = 11000
+    entity._refresh_value()
+
+    coordinator.data = "error"
+    entity._refresh_value()
+
+    assert entity.native_value == 1.0
+    assert entity.extra_state_attributes["current_energy"] == "error"